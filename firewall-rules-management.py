@@ -1,23 +1,353 @@
 import subprocess
 import logging
-import json
-import argparse
-from datetime import datetime
-import ipaddress
-import re
+import os
+import struct
 import sys
+from types import SimpleNamespace
+from collections import Counter
+
+_LOGGER = logging.getLogger(__name__)
+
+# Every other module, including argparse and the optional iptc module, is
+# imported inside the functions that use it, keeping startup cheap for
+# scripted single-rule invocations
+
+# Kernel socket tables read by analyze_traffic, with the hex state code
+# that marks a listening socket (TCP_LISTEN, or TCP_CLOSE for unbound UDP)
+_PROC_NET_TABLES = (
+    ('tcp', '/proc/net/tcp', b'0A'),
+    ('tcp6', '/proc/net/tcp6', b'0A'),
+    ('udp', '/proc/net/udp', b'07'),
+    ('udp6', '/proc/net/udp6', b'07'),
+)
+
+# Privileged helper started once under sudo and kept alive for the lifetime
+# of a FirewallRulesManager. Each request starts with an opcode byte:
+#   R: a job count followed, per job, by a length-prefixed, NUL-separated
+#      argv and length-prefixed stdin data. The jobs run concurrently; the
+#      reply holds, per job, the exit status followed by length-prefixed
+#      stdout and stderr data.
+#   O: one length-prefixed argv whose stdout is copied back in
+#      length-prefixed chunks, terminated by an empty chunk and followed by
+#      the exit status.
+#   S: a streaming session of sub-requests: 'o' plus a length-prefixed argv
+#      starts a command; 'd' plus a job index and length-prefixed data
+#      writes to that command's stdin and is answered by one byte (1 while
+#      the command still accepts input); 'c' closes every stdin and is
+#      answered by the job count and each exit status.
+_SUDO_DRIVER = r'''
+import struct, subprocess, sys
+from concurrent.futures import ThreadPoolExecutor
+
+rfile, wfile = sys.stdin.buffer, sys.stdout.buffer
+
+def read_frame():
+    header = rfile.read(4)
+    if len(header) < 4:
+        return None
+    return rfile.read(struct.unpack('>I', header)[0])
+
+def run(job):
+    argv, data = job
+    try:
+        process = subprocess.run(
+            argv.split(b'\0'), input=data, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+        return process.returncode, process.stdout, process.stderr
+    except OSError as e:
+        return 127, b'', str(e).encode()
+
+def run_jobs(executor):
+    header = rfile.read(4)
+    if len(header) < 4:
+        return False
+    jobs = [(read_frame(), read_frame()) for _ in range(struct.unpack('>I', header)[0])]
+    if any(frame is None for job in jobs for frame in job):
+        return False
+    for returncode, output, errors in executor.map(run, jobs):
+        wfile.write(struct.pack('>iI', returncode, len(output)) + output)
+        wfile.write(struct.pack('>I', len(errors)) + errors)
+    wfile.flush()
+    return True
+
+def stream_output():
+    argv = read_frame()
+    if argv is None:
+        return False
+    try:
+        process = subprocess.Popen(argv.split(b'\0'), stdout=subprocess.PIPE)
+    except OSError:
+        wfile.write(struct.pack('>Ii', 0, 127))
+        wfile.flush()
+        return True
+    while True:
+        chunk = process.stdout.read(65536)
+        if not chunk:
+            break
+        wfile.write(struct.pack('>I', len(chunk)) + chunk)
+    wfile.write(struct.pack('>Ii', 0, process.wait()))
+    wfile.flush()
+    return True
+
+def stream_input():
+    processes = []
+    while True:
+        kind = rfile.read(1)
+        if kind == b'o':
+            argv = read_frame()
+            if argv is None:
+                return False
+            try:
+                process = subprocess.Popen(
+                    argv.split(b'\0'), stdin=subprocess.PIPE, stdout=subprocess.DEVNULL
+                )
+            except OSError:
+                process = None
+            processes.append([process, process is not None])
+        elif kind == b'd':
+            header = rfile.read(4)
+            data = read_frame()
+            if len(header) < 4 or data is None:
+                return False
+            job = processes[struct.unpack('>I', header)[0]]
+            if job[1]:
+                try:
+                    job[0].stdin.write(data)
+                    job[0].stdin.flush()
+                except BrokenPipeError:
+                    job[1] = False
+            wfile.write(b'\1' if job[1] else b'\0')
+            wfile.flush()
+        elif kind == b'c':
+            codes = []
+            for process, _ in processes:
+                if process is None:
+                    codes.append(127)
+                    continue
+                try:
+                    process.stdin.close()
+                except BrokenPipeError:
+                    pass
+                codes.append(process.wait())
+            wfile.write(struct.pack('>I', len(codes)))
+            wfile.write(b''.join(struct.pack('>i', code) for code in codes))
+            wfile.flush()
+            return True
+        else:
+            return False
+
+with ThreadPoolExecutor(max_workers=2) as executor:
+    while True:
+        opcode = rfile.read(1)
+        if opcode == b'R':
+            alive = run_jobs(executor)
+        elif opcode == b'O':
+            alive = stream_output()
+        elif opcode == b'S':
+            alive = stream_input()
+        else:
+            alive = False
+        if not alive:
+            break
+'''
+
+# iptables-restore variant handling each address family
+_RESTORE_COMMANDS = {
+    'ip': 'iptables-restore',
+    'ip6': 'ip6tables-restore',
+}
+
+# Rules per COMMIT block when streaming a batch file to iptables-restore
+_BATCH_CHUNK_SIZE = 1024
+
+# Characters allowed in chain and protocol names; anything else could
+# smuggle extra directives into the iptables-restore input
+_TOKEN_CHARS = frozenset(
+    'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_.-'
+)
+
+def _rule_spec(action, chain, protocol, source_ip, destination_port):
+    """
+    Build one iptables-restore rule line
+    
+    Args:
+        action (str): '-A' to append or '-D' to delete
+        chain (str): iptables chain (INPUT/OUTPUT/FORWARD)
+        protocol (str): Network protocol
+        source_ip (str): Source IP address
+        destination_port (int): Destination port
+    
+    Returns:
+        str: Rule spec such as '-A INPUT -p tcp -s 1.2.3.4 --dport 22 -j ACCEPT'
+    """
+    return f"{action} {chain} -p {protocol} -s {source_ip} --dport {destination_port} -j ACCEPT"
+
+def _nft_rule_expr(family, protocol, source_ip, destination_port):
+    """
+    Build the nftables JSON expression list for an ACCEPT rule
+    
+    Args:
+        family (str): nftables address family ('ip' or 'ip6')
+        protocol (str): Network protocol
+        source_ip (str): Source IP address
+        destination_port (int): Destination port
+    
+    Returns:
+        list: Statements matching source address and destination port
+    """
+    return [
+        {'match': {'op': '==', 'left': {'payload': {'protocol': family, 'field': 'saddr'}},
+                   'right': source_ip}},
+        {'match': {'op': '==', 'left': {'payload': {'protocol': protocol, 'field': 'dport'}},
+                   'right': int(destination_port)}},
+        {'accept': None},
+    ]
+
+def _nft_normalize_expr(expr):
+    """
+    Strip statements that iptables-nft adds but _nft_rule_expr() omits
+    
+    Counters and the explicit `meta l4proto` match are dropped so rules
+    created by either tool compare equal.
+    
+    Args:
+        expr (list): Expression list from `nft -j list`
+    
+    Returns:
+        list: Expression list comparable with _nft_rule_expr() output
+    """
+    return [
+        statement for statement in expr
+        if 'counter' not in statement
+        and statement.get('match', {}).get('left') != {'meta': {'key': 'l4proto'}}
+    ]
+
+class _RestorePipe:
+    """
+    Persistent `iptables-restore --noflush` children fed by a writer thread
+    
+    One child is started per address family on first use, through the
+    manager's streaming session (the long-lived sudo helper, or directly
+    when running as root). Submitted blocks go through a bounded queue that
+    the writer thread drains, coalescing what is queued for each family
+    into a single write. Parsing the next rules overlaps with the kernel
+    committing the previous block, while a slow child blocks submit()
+    instead of letting the whole input pile up in memory.
+    """
+    
+    # Maximum number of blocks waiting for the writer thread
+    _MAX_QUEUED = 16
+    
+    def __init__(self, manager):
+        """
+        Args:
+            manager (FirewallRulesManager): Owner of the streaming session
+        """
+        import queue
+        import threading
+        
+        self._manager = manager
+        self._manager._stream_begin()
+        self._jobs = {}
+        self._queue = queue.Queue(maxsize=self._MAX_QUEUED)
+        self._failed = False
+        self._error = None
+        self._writer = threading.Thread(target=self._drain, daemon=True)
+        self._writer.start()
+    
+    def _drain(self):
+        done = False
+        while not done:
+            items = [self._queue.get()]
+            while not self._queue.empty():
+                items.append(self._queue.get_nowait())
+            
+            if None in items:
+                items = items[:items.index(None)]
+                done = True
+            
+            if self._failed:
+                # Keep consuming so a blocked submit() can return
+                continue
+            
+            blocks = {}
+            for family, block in items:
+                blocks.setdefault(family, []).append(block)
+            
+            try:
+                for family, family_blocks in blocks.items():
+                    if family not in self._jobs:
+                        command = [_RESTORE_COMMANDS[family], '--noflush']
+                        self._jobs[family] = self._manager._stream_open(command)
+                    if not self._manager._stream_write(self._jobs[family], b''.join(family_blocks)):
+                        # The child exited early; close() reports its status
+                        self._failed = True
+            except OSError as e:
+                self._error = e
+                self._failed = True
+    
+    def submit(self, family, block):
+        """
+        Queue one complete `*filter ... COMMIT` block for a family's child
+        
+        Blocks while the queue is full.
+        
+        Args:
+            family (str): Address family ('ip' or 'ip6')
+            block (bytes): iptables-restore input ending with COMMIT
+        
+        Returns:
+            bool: False once a child or the helper has stopped accepting input
+        """
+        if self._failed:
+            return False
+        self._queue.put((family, block))
+        return True
+    
+    def close(self):
+        """
+        Flush queued blocks and wait for every restore child to exit
+        
+        Returns:
+            dict: Address family -> exit status
+        
+        Raises:
+            OSError: If the sudo helper exited during the session
+        """
+        self._queue.put(None)
+        self._writer.join()
+        if self._error is not None:
+            raise self._error
+        
+        returncodes = self._manager._stream_end()
+        return {family: returncodes[index] for family, index in self._jobs.items()}
 
 class FirewallRulesManager:
-    def __init__(self, log_file='firewall_rules.log'):
+    def __init__(self, log_file='firewall_rules.log', verbose=False):
         """
         Initialize the Firewall Rules Management System
         
         Args:
             log_file (str): Path to the log file for tracking rule changes
+            verbose (bool): Echo each rule change to stdout
         """
         self.log_file = log_file
+        self.verbose = verbose
         self.config_file = 'firewall_config.json'
         
+        # Rule changes queued for the next transaction, as _rule_spec() args
+        self._pending = []
+        
+        # Path of the nft binary, looked up on first flush; '' when nft is
+        # absent or iptables does not use the nf_tables backend
+        self._nft = None
+        
+        # Long-lived sudo helper, started on first privileged command
+        self._helper = None
+        
+        # Commands of the current streaming session when running as root
+        self._streams = []
+        
         # Configure logging
         logging.basicConfig(
             filename=self.log_file, 
@@ -32,32 +362,455 @@ class FirewallRulesManager:
         """
         Verify sudo access for iptables modifications
         """
+        # Already root (systemd units, container entrypoints): no sudo needed
+        if os.geteuid() == 0:
+            return
+        
         try:
             subprocess.run(['sudo', '-n', 'true'], check=True)
         except subprocess.CalledProcessError:
-            logging.error("Insufficient sudo privileges")
+            _LOGGER.error("Insufficient sudo privileges")
             raise PermissionError("This script requires sudo access to modify firewall rules")
     
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        # Apply changes still queued when the block finishes cleanly
+        if exc_type is None:
+            self.flush()
+        self.close()
+    
+    def __del__(self):
+        self.close()
+    
+    def close(self):
+        """
+        Stop the privileged helper process, if one was started
+        
+        Rule changes still queued are discarded; call flush() first to
+        apply them.
+        """
+        if getattr(self, '_pending', None):
+            _LOGGER.warning(
+                f"Discarding {len(self._pending)} queued rule change(s) "
+                f"that were never flushed"
+            )
+            self._pending = []
+        
+        helper, self._helper = getattr(self, '_helper', None), None
+        if helper is not None:
+            helper.stdin.close()
+            helper.wait()
+    
+    def _run(self, command, input=b''):
+        """
+        Run a command as root through the long-lived sudo helper
+        
+        Args:
+            command (list): Command argv, without the leading 'sudo'
+            input (bytes): Data fed to the command's stdin
+        
+        Returns:
+            subprocess.CompletedProcess: Exit status, captured stdout and stderr
+        
+        Raises:
+            subprocess.CalledProcessError: If the command exits non-zero
+        """
+        result = self._run_many([(command, input)])[0]
+        if result.returncode != 0:
+            raise subprocess.CalledProcessError(
+                result.returncode, command, result.stdout, result.stderr
+            )
+        return result
+    
+    def _run_many(self, jobs):
+        """
+        Run several commands as root concurrently through the sudo helper
+        
+        When the process already runs as root, the commands are run
+        directly without sudo or the helper.
+        
+        Args:
+            jobs (list): (command, input) pairs, as taken by _run()
+        
+        Returns:
+            list: subprocess.CompletedProcess for each job, in order
+        """
+        if os.geteuid() == 0:
+            # Already root: run the jobs directly instead of via the helper
+            return self._run_local(jobs)
+        
+        self._start_helper()
+        
+        request = [b'R', struct.pack('>I', len(jobs))]
+        for command, input in jobs:
+            argv = b'\0'.join(arg.encode() for arg in command)
+            request += [struct.pack('>I', len(argv)), argv, struct.pack('>I', len(input)), input]
+        self._helper_write(b''.join(request))
+        
+        results = []
+        for command, _ in jobs:
+            returncode, length = struct.unpack('>iI', self._helper_read(8))
+            output = self._helper_read(length)
+            length = struct.unpack('>I', self._helper_read(4))[0]
+            errors = self._helper_read(length)
+            results.append(subprocess.CompletedProcess(command, returncode, output, errors))
+        
+        return results
+    
+    def _run_to_file(self, command, f):
+        """
+        Run a command as root, streaming its stdout into a binary file
+        
+        The output is never held in memory as a whole: as root the file
+        descriptor is handed to the command directly, otherwise the sudo
+        helper copies it back in 64 KiB chunks.
+        
+        Args:
+            command (list): Command argv, without the leading 'sudo'
+            f (file): Binary file object opened for writing
+        
+        Raises:
+            subprocess.CalledProcessError: If the command exits non-zero
+        """
+        if os.geteuid() == 0:
+            f.flush()
+            subprocess.run(command, stdout=f, check=True)
+            return
+        
+        self._start_helper()
+        argv = b'\0'.join(arg.encode() for arg in command)
+        self._helper_write(b'O' + struct.pack('>I', len(argv)) + argv)
+        
+        while True:
+            length = struct.unpack('>I', self._helper_read(4))[0]
+            if not length:
+                break
+            f.write(self._helper_read(length))
+        
+        returncode = struct.unpack('>i', self._helper_read(4))[0]
+        if returncode != 0:
+            raise subprocess.CalledProcessError(returncode, command)
+    
+    def _stream_begin(self):
+        """
+        Start a streaming session for commands fed incrementally on stdin
+        """
+        # Job indexes restart with every session
+        self._streams = []
+        if os.geteuid() == 0:
+            return
+        
+        self._start_helper()
+        self._helper_write(b'S')
+    
+    def _stream_open(self, command):
+        """
+        Start a command in the current streaming session
+        
+        Args:
+            command (list): Command argv, without the leading 'sudo'
+        
+        Returns:
+            int: Job index used by _stream_write()
+        """
+        if os.geteuid() == 0:
+            try:
+                process = subprocess.Popen(
+                    command, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL
+                )
+            except OSError:
+                process = None
+            self._streams.append([process, process is not None])
+            return len(self._streams) - 1
+        
+        argv = b'\0'.join(arg.encode() for arg in command)
+        self._helper_write(b'o' + struct.pack('>I', len(argv)) + argv)
+        self._streams.append(None)
+        return len(self._streams) - 1
+    
+    def _stream_write(self, index, data):
+        """
+        Write data to the stdin of a streaming session command
+        
+        Args:
+            index (int): Job index returned by _stream_open()
+            data (bytes): Data to write
+        
+        Returns:
+            bool: False once the command no longer accepts input
+        """
+        if os.geteuid() == 0:
+            job = self._streams[index]
+            if job[1]:
+                try:
+                    job[0].stdin.write(data)
+                    job[0].stdin.flush()
+                except BrokenPipeError:
+                    job[1] = False
+            return job[1]
+        
+        self._helper_write(b'd' + struct.pack('>II', index, len(data)) + data)
+        return self._helper_read(1) == b'\1'
+    
+    def _stream_end(self):
+        """
+        Close the streaming session and wait for its commands to exit
+        
+        Returns:
+            list: Exit status of each command, by job index
+        """
+        streams, self._streams = self._streams, []
+        if os.geteuid() == 0:
+            returncodes = []
+            for process, _ in streams:
+                if process is None:
+                    returncodes.append(127)
+                    continue
+                try:
+                    process.stdin.close()
+                except BrokenPipeError:
+                    pass
+                returncodes.append(process.wait())
+            return returncodes
+        
+        self._helper_write(b'c')
+        count = struct.unpack('>I', self._helper_read(4))[0]
+        return list(struct.unpack(f'>{count}i', self._helper_read(4 * count)))
+    
+    def _start_helper(self):
+        """
+        Start the long-lived sudo helper if it is not already running
+        """
+        if self._helper is None:
+            # sudo -n: the helper's stdin carries requests, not a password.
+            # -I: isolated mode, so the root interpreter never imports
+            # modules from the caller's working directory or environment
+            self._helper = subprocess.Popen(
+                ['sudo', '-n', sys.executable, '-I', '-c', _SUDO_DRIVER],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE
+            )
+    
+    def _helper_write(self, data):
+        """
+        Send request bytes to the sudo helper
+        
+        Args:
+            data (bytes): Encoded request
+        
+        Raises:
+            BrokenPipeError: If the helper has exited; it is then discarded
+            so the next request starts a fresh one
+        """
+        try:
+            self._helper.stdin.write(data)
+            self._helper.stdin.flush()
+        except (OSError, ValueError):
+            self._discard_helper()
+            raise BrokenPipeError("Privileged helper exited unexpectedly")
+    
+    def _helper_read(self, size):
+        """
+        Read exactly size reply bytes from the sudo helper
+        
+        Args:
+            size (int): Number of bytes to read
+        
+        Returns:
+            bytes: Reply data
+        
+        Raises:
+            BrokenPipeError: If the helper has exited; it is then discarded
+            so the next request starts a fresh one
+        """
+        data = self._helper.stdout.read(size)
+        if len(data) < size:
+            self._discard_helper()
+            raise BrokenPipeError("Privileged helper exited unexpectedly")
+        return data
+    
+    def _discard_helper(self):
+        """
+        Kill and reap a helper whose pipe broke
+        """
+        helper, self._helper = self._helper, None
+        # Any streaming session died with the helper
+        self._streams = []
+        helper.kill()
+        for stream in (helper.stdin, helper.stdout):
+            try:
+                stream.close()
+            except OSError:
+                pass
+        helper.wait()
+    
+    def _run_local(self, jobs):
+        """
+        Run several commands concurrently in this process
+        
+        Args:
+            jobs (list): (command, input) pairs, as taken by _run()
+        
+        Returns:
+            list: subprocess.CompletedProcess for each job, in order
+        """
+        def run(job):
+            command, input = job
+            try:
+                return subprocess.run(
+                    command, input=input, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+                )
+            except OSError as e:
+                return subprocess.CompletedProcess(command, 127, b'', str(e).encode())
+        
+        if len(jobs) == 1:
+            return [run(jobs[0])]
+        
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            return list(executor.map(run, jobs))
+    
     def list_current_rules(self):
         """
-        List current iptables rules
+        List current iptables rules of the filter table
+        
+        When running as root with python-iptables installed, rules are
+        read in-process through libiptc; otherwise they are parsed from
+        `iptables -S` output. Either way rules are returned as rule specs
+        such as '-A INPUT -p tcp -m tcp --dport 22 -j ACCEPT'.
         
         Returns:
-            list: Current firewall rules
+            list: (chain, rules) pairs for each chain of the filter table
         """
+        chains = None
+        
+        # libiptc needs CAP_NET_ADMIN, so it is only usable as root
+        if os.geteuid() == 0:
+            try:
+                import iptc
+            except Exception:
+                # python-iptables is optional, and importing it raises
+                # XTablesError when libxtables is missing or mismatched;
+                # fall back to the iptables CLI
+                iptc = None
+            
+            if iptc is not None:
+                try:
+                    chains = [
+                        (chain, [self._rule_dict_to_spec(chain, rule) for rule in rules])
+                        for chain, rules in iptc.easy.dump_table('filter', ipv6=False).items()
+                    ]
+                except (iptc.IPTCError, ValueError, TypeError) as e:
+                    _LOGGER.warning(f"libiptc read failed, using iptables -S: {e}")
+        
         try:
-            result = subprocess.run(
-                ['sudo', 'iptables', '-L', '-n', '-v'], 
-                capture_output=True, 
-                text=True, 
-                check=True
-            )
+            if chains is None:
+                result = self._run(['iptables', '-S'])
+                chains = self._parse_rule_specs(result.stdout)
+            
             print("Current Firewall Rules:")
-            print(result.stdout)
-            return result.stdout
+            for chain, rules in chains:
+                print(f"Chain {chain}")
+                for rule in rules:
+                    print(f"    {rule}")
+            return chains
         except subprocess.CalledProcessError as e:
-            logging.error(f"Failed to list rules: {e}")
+            _LOGGER.error(
+                f"Failed to list rules: {e.cmd[0]} exited with {e.returncode}: "
+                f"{e.stderr.decode(errors='replace').strip()}"
+            )
             return []
+        except OSError as e:
+            _LOGGER.error(f"Failed to list rules: {e}")
+            return []
+    
+    def _parse_rule_specs(self, output):
+        """
+        Group `iptables -S` output by chain
+        
+        The output is split as bytes; only chain names and rule lines
+        are decoded, policy and chain declarations are not.
+        
+        Args:
+            output (bytes): Rule specs printed by `iptables -S`
+        
+        Returns:
+            list: (chain, rules) pairs in the order chains were listed
+        """
+        chains = {}
+        for line in output.splitlines():
+            parts = line.split(None, 2)
+            if len(parts) < 2:
+                continue
+            
+            rules = chains.setdefault(parts[1].decode(), [])
+            if parts[0] == b'-A':
+                rules.append(line.decode())
+        
+        return list(chains.items())
+    
+    def _rule_dict_to_spec(self, chain, rule):
+        """
+        Render a python-iptables rule dict in `iptables -S` syntax
+        
+        Args:
+            chain (str): Chain the rule belongs to
+            rule (dict): Rule as returned by iptc.easy.dump_table()
+        
+        Returns:
+            str: Rule spec such as '-A INPUT -s 10.0.0.1/32 -j ACCEPT'
+        """
+        import ipaddress
+        
+        def negatable(flag, value):
+            if value.startswith('!'):
+                return ['!', flag, value[1:]]
+            return [flag, value]
+        
+        def parameters(params):
+            args = []
+            for name, values in params.items():
+                if isinstance(values, str):
+                    values = values.split()
+                if values and values[0] == '!':
+                    args.append('!')
+                    values = values[1:]
+                args.append(f'--{name}')
+                args.extend(values)
+            return args
+        
+        parts = ['-A', chain]
+        for key, flag in (('src', '-s'), ('dst', '-d')):
+            if key in rule:
+                value = rule[key]
+                negated = value.startswith('!')
+                # libiptc reports netmasks ('/255.255.255.255'); -S prints prefixes
+                network = ipaddress.ip_network(value.lstrip('!'), strict=False)
+                parts += negatable(flag, ('!' if negated else '') + network.with_prefixlen)
+        for key, flag in (('in-interface', '-i'), ('out-interface', '-o'), ('protocol', '-p')):
+            if key in rule:
+                parts += negatable(flag, rule[key])
+        if rule.get('fragment'):
+            parts.append('-f')
+        
+        for key, value in rule.items():
+            if key in ('src', 'dst', 'in-interface', 'out-interface', 'protocol',
+                       'fragment', 'target', 'goto', 'counters'):
+                continue
+            for params in value if isinstance(value, list) else [value]:
+                parts += ['-m', key] + parameters(params)
+        
+        for key, flag in (('target', '-j'), ('goto', '-g')):
+            target = rule.get(key)
+            if isinstance(target, dict):
+                for name, params in target.items():
+                    parts += [flag, name] + parameters(params)
+            elif target:
+                parts += [flag, target]
+        
+        return ' '.join(parts)
     
     def validate_ip(self, ip):
         """
@@ -69,6 +822,22 @@ class FirewallRulesManager:
         Returns:
             bool: True if valid, False otherwise
         """
+        # Fast path for dotted-quad IPv4 without building an address object;
+        # leading zeros are rejected to match ipaddress
+        if ip.count('.') == 3 and ':' not in ip:
+            return all(
+                octet.isascii() and octet.isdigit() and len(octet) <= 3
+                and (octet == '0' or octet[0] != '0') and int(octet) < 256
+                for octet in ip.split('.')
+            )
+        
+        # Scoped IPv6 addresses (fe80::1%eth0) are not valid iptables
+        # sources, and the scope ID may hold arbitrary characters
+        if '%' in ip:
+            return False
+        
+        import ipaddress
+        
         try:
             ipaddress.ip_address(ip)
             return True
@@ -77,7 +846,7 @@ class FirewallRulesManager:
     
     def add_rule(self, chain, source_ip, destination_port, protocol='tcp'):
         """
-        Add a new firewall rule
+        Queue a new firewall rule; queued changes are applied by flush()
         
         Args:
             chain (str): iptables chain (INPUT/OUTPUT/FORWARD)
@@ -86,42 +855,48 @@ class FirewallRulesManager:
             protocol (str): Network protocol
         
         Returns:
-            bool: True if rule added successfully
+            bool: True if rule was queued successfully
         """
         # Validate inputs
-        if not self.validate_ip(source_ip):
-            logging.error(f"Invalid IP address: {source_ip}")
+        validated = self._validate_rule(chain, source_ip, destination_port, protocol)
+        if validated is None:
             return False
+        source_ip, destination_port = validated
         
-        try:
-            rule_command = [
-                'sudo', 'iptables', '-A', chain,
-                '-p', protocol,
-                '-s', source_ip,
-                '--dport', str(destination_port),
-                '-j', 'ACCEPT'
-            ]
-            
-            subprocess.run(rule_command, check=True)
-            
-            # Log the rule addition
-            log_message = (
-                f"Rule Added: Chain={chain}, "
-                f"Source IP={source_ip}, "
-                f"Destination Port={destination_port}, "
-                f"Protocol={protocol}"
-            )
-            logging.info(log_message)
-            print(log_message)
-            
-            return True
-        except subprocess.CalledProcessError as e:
-            logging.error(f"Failed to add rule: {e}")
-            return False
+        self._pending.append(('-A', chain, protocol, source_ip, destination_port))
+        
+        self._log_rule('Addition', chain, source_ip, destination_port, protocol)
+        
+        return True
     
     def delete_rule(self, chain, source_ip, destination_port, protocol='tcp'):
         """
-        Delete an existing firewall rule
+        Queue deletion of an existing firewall rule; applied by flush()
+        
+        Args:
+            chain (str): iptables chain (INPUT/OUTPUT/FORWARD)
+            source_ip (str): Source IP address
+            destination_port (int): Destination port
+            protocol (str): Network protocol
+        
+        Returns:
+            bool: True if rule deletion was queued successfully
+        """
+        # Validate inputs
+        validated = self._validate_rule(chain, source_ip, destination_port, protocol)
+        if validated is None:
+            return False
+        source_ip, destination_port = validated
+        
+        self._pending.append(('-D', chain, protocol, source_ip, destination_port))
+        
+        self._log_rule('Deletion', chain, source_ip, destination_port, protocol)
+        
+        return True
+    
+    def _validate_rule(self, chain, source_ip, destination_port, protocol):
+        """
+        Validate the arguments of a rule change before it is queued
         
         Args:
             chain (str): iptables chain (INPUT/OUTPUT/FORWARD)
@@ -130,33 +905,319 @@ class FirewallRulesManager:
             protocol (str): Network protocol
         
         Returns:
-            bool: True if rule deleted successfully
+            tuple: (source_ip, destination_port) with the address in
+            canonical form and the port as an integer, or None if any
+            argument is invalid
         """
+        if not isinstance(source_ip, str) or not self.validate_ip(source_ip):
+            _LOGGER.error(f"Invalid IP address: {source_ip!r}")
+            return None
+        
+        if ':' in source_ip:
+            import ipaddress
+            
+            # Only the canonical form reaches the iptables-restore input
+            source_ip = str(ipaddress.ip_address(source_ip))
+        
+        for name, token in (('chain', chain), ('protocol', protocol)):
+            if not isinstance(token, str) or not token or not set(token) <= _TOKEN_CHARS:
+                _LOGGER.error(f"Invalid {name}: {token!r}")
+                return None
+        
+        try:
+            port = int(destination_port)
+        except (TypeError, ValueError):
+            port = -1
+        if not 0 <= port <= 65535:
+            _LOGGER.error(f"Invalid destination port: {destination_port!r}")
+            return None
+        
+        return source_ip, port
+    
+    def _log_rule(self, action, chain, source_ip, destination_port, protocol):
+        """
+        Log a queued rule change, echoing it to stdout in verbose mode
+        
+        The change is only applied later by flush() or add_batch(), which
+        log the outcome. The message is only formatted when it will
+        actually be emitted.
+        """
+        log_enabled = _LOGGER.isEnabledFor(logging.INFO)
+        if not (log_enabled or self.verbose):
+            return
+        
+        message = (
+            f"Rule {action} Queued: Chain={chain}, Source IP={source_ip}, "
+            f"Destination Port={destination_port}, Protocol={protocol}"
+        )
+        if log_enabled:
+            _LOGGER.info(message)
+        if self.verbose:
+            sys.stdout.write(message + '\n')
+    
+    def add_batch(self, batch_file):
+        """
+        Apply firewall rules read from a batch file
+        
+        Each non-empty line holds CHAIN SOURCE_IP PORT [PROTOCOL];
+        lines starting with '#' are ignored. Rules are streamed in blocks
+        of _BATCH_CHUNK_SIZE to one persistent iptables-restore process,
+        so arbitrarily large files are applied without holding them in
+        memory.
+        
+        Args:
+            batch_file (str): Path to the batch file ('-' reads stdin)
+        
+        Returns:
+            bool: True if every rule in the file was applied
+        """
+        success = True
+        # One restore process per address family, started on first use;
+        # IPv4 and IPv6 rules are committed concurrently
+        restore_pipe = _RestorePipe(self)
+        
+        returncodes = None
         try:
-            rule_command = [
-                'sudo', 'iptables', '-D', chain,
-                '-p', protocol,
-                '-s', source_ip,
-                '--dport', str(destination_port),
-                '-j', 'ACCEPT'
-            ]
+            try:
+                # Undecodable bytes become U+FFFD and fail rule validation
+                f = (
+                    sys.stdin if batch_file == '-'
+                    else open(batch_file, 'r', errors='replace')
+                )
+                with f:
+                    for line_number, line in enumerate(f, 1):
+                        fields = line.split()
+                        if not fields or fields[0].startswith('#'):
+                            continue
+                        
+                        if len(fields) not in (3, 4) or not fields[2].isdigit():
+                            _LOGGER.error(
+                                f"Malformed rule on line {line_number} of {batch_file}"
+                            )
+                            success = False
+                            continue
+                        
+                        protocol = fields[3] if len(fields) == 4 else 'tcp'
+                        if not self.add_rule(fields[0], fields[1], int(fields[2]), protocol):
+                            success = False
+                        
+                        if len(self._pending) >= _BATCH_CHUNK_SIZE:
+                            if not self._submit_pending(restore_pipe):
+                                # A restore process died; stop reading the file
+                                success = False
+                                break
+            except (OSError, ValueError) as e:
+                _LOGGER.error(f"Failed to read batch file: {e}")
+                success = False
+            
+            self._submit_pending(restore_pipe)
+        finally:
+            # Always end the streaming session so the helper is left idle
+            self._pending = []
+            try:
+                returncodes = restore_pipe.close()
+            except OSError as e:
+                _LOGGER.error(f"Failed to apply batch file: {e}")
+        
+        if returncodes is None:
+            return False
+        
+        for family, returncode in returncodes.items():
+            if returncode != 0:
+                _LOGGER.error(
+                    f"Failed to apply batch file: {_RESTORE_COMMANDS[family]} "
+                    f"exited with {returncode}"
+                )
+                success = False
+        
+        if not success:
+            return False
+        
+        _LOGGER.info(f"Applied rules from batch file {batch_file}")
+        return success
+    
+    def _submit_pending(self, restore_pipe):
+        """
+        Hand queued rules to the restore pipe of add_batch
+        
+        Args:
+            restore_pipe (_RestorePipe): Pipe feeding the restore processes
+        
+        Returns:
+            bool: False if a restore process no longer accepts input
+        """
+        accepted = True
+        for family, rules in self._split_by_family(self._pending).items():
+            if not restore_pipe.submit(family, self._render_batch(rules)):
+                accepted = False
+        self._pending = []
+        return accepted
+    
+    def _split_by_family(self, rules):
+        """
+        Group queued rule changes by the address family of their source
+        
+        Args:
+            rules (list): Queued rule changes, as _rule_spec() arguments
+        
+        Returns:
+            dict: Address family ('ip' or 'ip6') -> rule changes
+        """
+        families = {}
+        for rule in rules:
+            family = 'ip6' if ':' in rule[3] else 'ip'
+            families.setdefault(family, []).append(rule)
+        return families
+    
+    def _render_batch(self, rules):
+        """
+        Build iptables-restore/ip6tables-restore input for the filter table
+        
+        Args:
+            rules (list): Queued rule changes, as _rule_spec() arguments
+        
+        Returns:
+            bytes: A complete `*filter ... COMMIT` block
+        """
+        specs = "\n".join(_rule_spec(*rule) for rule in rules)
+        return ("*filter\n" + specs + "\nCOMMIT\n").encode()
+    
+    def _render_nft_batch(self, rules):
+        """
+        Build one nftables JSON transaction for the queued rule changes
+        
+        Deletions are resolved to rule handles by listing the affected
+        chains once each.
+        
+        Args:
+            rules (list): Queued rule changes, as _rule_spec() arguments
+        
+        Returns:
+            bytes: `nft -j -f -` input, or None if a deletion has no
+            matching rule in the ruleset
+        """
+        import json
+        
+        commands = []
+        chain_rules = {}
+        for action, chain, protocol, source_ip, destination_port in rules:
+            family = 'ip6' if ':' in source_ip else 'ip'
+            expr = _nft_rule_expr(family, protocol, source_ip, destination_port)
             
-            subprocess.run(rule_command, check=True)
+            if action == '-A':
+                commands.append({'add': {'rule': {
+                    'family': family, 'table': 'filter', 'chain': chain, 'expr': expr
+                }}})
+                continue
             
-            # Log the rule deletion
-            log_message = (
-                f"Rule Deleted: Chain={chain}, "
-                f"Source IP={source_ip}, "
-                f"Destination Port={destination_port}, "
-                f"Protocol={protocol}"
-            )
-            logging.info(log_message)
-            print(log_message)
+            if (family, chain) not in chain_rules:
+                listing = self._run([self._nft, '-j', 'list', 'chain', family, 'filter', chain])
+                chain_rules[(family, chain)] = [
+                    item['rule'] for item in json.loads(listing.stdout)['nftables']
+                    if 'rule' in item
+                ]
+            
+            # Like iptables -D, remove the first matching rule
+            candidates = chain_rules[(family, chain)]
+            for index, rule in enumerate(candidates):
+                if _nft_normalize_expr(rule['expr']) == expr:
+                    del candidates[index]
+                    break
+            else:
+                return None
             
+            commands.append({'delete': {'rule': {
+                'family': family, 'table': 'filter', 'chain': chain, 'handle': rule['handle']
+            }}})
+        
+        return json.dumps({'nftables': commands}, separators=(',', ':')).encode()
+    
+    def _find_nft(self):
+        """
+        Locate nft, but only when iptables itself uses nf_tables
+        
+        On iptables-legacy hosts the iptables tables do not exist in
+        nftables, and rules added there would be invisible to iptables.
+        
+        Returns:
+            str: Path of the nft binary, or '' if it should not be used
+        """
+        import shutil
+        
+        nft = shutil.which('nft') or shutil.which('nft', path='/usr/sbin:/sbin')
+        if not nft:
+            return ''
+        
+        try:
+            version = self._run(['iptables', '-V']).stdout
+        except (subprocess.CalledProcessError, OSError):
+            return ''
+        return nft if b'nf_tables' in version else ''
+    
+    def flush(self):
+        """
+        Apply all queued rule changes in a single transaction
+        
+        When nft is installed and iptables uses the nf_tables backend, the
+        changes are submitted as one atomic nftables JSON transaction;
+        otherwise, or if that fails, they are applied with one
+        iptables-restore call for IPv4 and one ip6tables-restore call for
+        IPv6, run in parallel.
+        
+        Returns:
+            bool: True if the queued changes were applied successfully
+        """
+        if not self._pending:
             return True
-        except subprocess.CalledProcessError as e:
-            logging.error(f"Failed to delete rule: {e}")
+        
+        pending, self._pending = self._pending, []
+        
+        if self._nft is None:
+            self._nft = self._find_nft()
+        
+        if self._nft:
+            try:
+                batch = self._render_nft_batch(pending)
+                if batch is not None:
+                    self._run([self._nft, '-j', '-f', '-'], batch)
+                    _LOGGER.info(f"Applied {len(pending)} queued rule change(s) via nftables")
+                    return True
+            except subprocess.CalledProcessError as e:
+                _LOGGER.warning(
+                    f"nftables transaction failed, using iptables-restore: "
+                    f"{e.cmd[0]} exited with {e.returncode}: "
+                    f"{e.stderr.decode(errors='replace').strip()}"
+                )
+            except (OSError, ValueError, KeyError) as e:
+                _LOGGER.warning(f"nftables transaction failed, using iptables-restore: {e}")
+        
+        # IPv4 and IPv6 tables are locked independently, so both restore
+        # commands run concurrently in the helper
+        batches = self._split_by_family(pending)
+        jobs = [
+            ([_RESTORE_COMMANDS[family], '--noflush'], self._render_batch(rules))
+            for family, rules in batches.items()
+        ]
+        
+        try:
+            results = self._run_many(jobs)
+        except OSError as e:
+            _LOGGER.error(f"Failed to apply {len(pending)} queued rule change(s): {e}")
             return False
+        
+        success = True
+        for result in results:
+            if result.returncode != 0:
+                _LOGGER.error(
+                    f"Failed to apply queued rule changes: {result.args[0]} "
+                    f"exited with {result.returncode}: "
+                    f"{result.stderr.decode(errors='replace').strip()}"
+                )
+                success = False
+        
+        if success:
+            _LOGGER.info(f"Applied {len(pending)} queued rule change(s)")
+        return success
     
     def analyze_traffic(self):
         """
@@ -166,111 +1227,210 @@ class FirewallRulesManager:
             dict: Traffic analysis summary
         """
         try:
-            # Use netstat to capture network connections
-            result = subprocess.run(
-                ['sudo', 'netstat', '-tuln'], 
-                capture_output=True, 
-                text=True, 
-                check=True
-            )
+            # Read the kernel socket tables directly instead of running netstat
+            total_connections = 0
+            listening_ports = Counter()
+            connection_protocols = Counter()
+            
+            for protocol, path, listen_state in _PROC_NET_TABLES:
+                try:
+                    with open(path, 'rb') as f:
+                        sockets = f.read().splitlines()[1:]
+                except FileNotFoundError:
+                    # Protocol family not available on this kernel
+                    continue
+                
+                total_connections += len(sockets)
+                
+                # Columns: sl local_address rem_address st ...; only the
+                # first four are needed, so stop splitting after them
+                local_addresses = [
+                    parts[1]
+                    for parts in (entry.split(None, 4) for entry in sockets)
+                    if len(parts) >= 4 and parts[3] == listen_state
+                ]
+                
+                # The kernel prints ports as four hex digits after the colon
+                listening_ports.update(int(address[-4:], 16) for address in local_addresses)
+                if local_addresses:
+                    connection_protocols[protocol] += len(local_addresses)
             
-            # Basic traffic analysis
-            connections = result.stdout.split('\n')
             analysis = {
-                'total_connections': len(connections),
-                'listening_ports': [],
-                'connection_protocols': {}
+                'total_connections': total_connections,
+                # Unique ports mapped to socket counts, busiest first
+                'listening_ports': dict(listening_ports.most_common()),
+                'connection_protocols': dict(connection_protocols)
             }
             
-            for conn in connections:
-                if re.search(r'\d+\.\d+\.\d+\.\d+:\d+', conn):
-                    parts = conn.split()
-                    if len(parts) >= 4:
-                        protocol = parts[0]
-                        port = parts[3].split(':')[-1]
-                        
-                        analysis['listening_ports'].append(port)
-                        analysis['connection_protocols'][protocol] = \
-                            analysis['connection_protocols'].get(protocol, 0) + 1
-            
-            logging.info("Traffic Analysis Completed")
+            _LOGGER.info("Traffic Analysis Completed")
             return analysis
-        except subprocess.CalledProcessError as e:
-            logging.error(f"Traffic analysis failed: {e}")
+        except OSError as e:
+            _LOGGER.error(f"Traffic analysis failed: {e}")
             return {}
     
     def save_configuration(self):
         """
-        Save current firewall configuration to a JSON file
+        Save current firewall configuration to the configuration file
+        
+        The file starts with a single JSON header line, followed by the
+        raw `iptables-save` dump streamed into the file.
         """
+        import json
+        import time
+        
         try:
-            current_rules = self.list_current_rules()
-            config = {
-                'timestamp': datetime.now().isoformat(),
-                'rules': current_rules
-            }
+            # Integer nanoseconds since the epoch; formatted only on restore
+            header = {'timestamp': time.time_ns()}
             
-            with open(self.config_file, 'w') as f:
-                json.dump(config, f, indent=4)
+            with open(self.config_file, 'wb', buffering=65536) as f:
+                f.write(json.dumps(header, separators=(',', ':')).encode() + b'\n')
+                self._run_to_file(['iptables-save'], f)
             
-            logging.info(f"Configuration saved to {self.config_file}")
+            _LOGGER.info(f"Configuration saved to {self.config_file}")
         except Exception as e:
-            logging.error(f"Failed to save configuration: {e}")
+            _LOGGER.error(f"Failed to save configuration: {e}")
     
     def restore_configuration(self):
         """
-        Restore firewall configuration from saved JSON file
+        Restore firewall configuration from the saved configuration file
         """
+        import json
+        
         try:
-            with open(self.config_file, 'r') as f:
-                config = json.load(f)
+            with open(self.config_file, 'rb') as f:
+                try:
+                    config = json.loads(f.readline())
+                except ValueError:
+                    # Files saved with the older pretty-printed JSON layout
+                    # span several lines; parse the whole document instead
+                    f.seek(0)
+                    config = json.load(f)
             
-            print(f"Restoring configuration from {config['timestamp']}")
+            # Integer nanoseconds; files in the old multi-line JSON layout
+            # hold an ISO 8601 string instead
+            timestamp = config['timestamp']
+            if isinstance(timestamp, int):
+                from datetime import datetime
+                timestamp = datetime.fromtimestamp(timestamp / 1e9).isoformat()
+            
+            print(f"Restoring configuration from {timestamp}")
             # Note: Actual rule restoration would require parsing the saved rules
-            logging.info(f"Configuration restored from {self.config_file}")
+            _LOGGER.info(f"Configuration restored from {self.config_file}")
         except FileNotFoundError:
-            logging.error("No saved configuration found")
+            _LOGGER.error("No saved configuration found")
         except Exception as e:
-            logging.error(f"Configuration restoration failed: {e}")
+            _LOGGER.error(f"Configuration restoration failed: {e}")
 
-def main():
-    if sys.platform != 'linux':
-        print("Error: This script is designed for Linux systems with iptables.")
-        sys.exit(1)
+# Command-line flags understood by the fast parser, with their value counts
+_CLI_FLAGS = {
+    '--list': 0,
+    '--add': 3,
+    '--delete': 3,
+    '--add-batch': 1,
+    '--analyze': 0,
+    '--save': 0,
+    '--restore': 0,
+    '--verbose': 0,
+}
 
+def parse_args_fast(argv):
+    """
+    Parse the common command-line forms without importing argparse
+    
+    Args:
+        argv (list): Command-line arguments, excluding the program name
+    
+    Returns:
+        SimpleNamespace: Parsed options, or None if argparse must handle
+        the arguments (help requested, unknown flags, missing values)
+    """
+    options = {
+        flag[2:].replace('-', '_'): (False if nargs == 0 else None)
+        for flag, nargs in _CLI_FLAGS.items()
+    }
+    
+    i = 0
+    while i < len(argv):
+        nargs = _CLI_FLAGS.get(argv[i])
+        if nargs is None:
+            return None
+        
+        values = argv[i + 1:i + 1 + nargs]
+        if len(values) < nargs or any(v.startswith('-') and v != '-' for v in values):
+            return None
+        
+        name = argv[i][2:].replace('-', '_')
+        if nargs == 0:
+            options[name] = True
+        elif nargs == 1:
+            options[name] = values[0]
+        else:
+            options[name] = values
+        i += 1 + nargs
+    
+    return SimpleNamespace(**options)
+
+def build_parser():
+    """
+    Build the full argparse parser, used for --help and error reporting
+    
+    Returns:
+        argparse.ArgumentParser: Command-line parser
+    """
+    import argparse
+    
     parser = argparse.ArgumentParser(description='Firewall Rules Management System')
     parser.add_argument('--list', action='store_true', help='List current firewall rules')
     parser.add_argument('--add', nargs=3, metavar=('CHAIN', 'SOURCE_IP', 'PORT'), 
                         help='Add a new firewall rule')
     parser.add_argument('--delete', nargs=3, metavar=('CHAIN', 'SOURCE_IP', 'PORT'), 
                         help='Delete an existing firewall rule')
+    parser.add_argument('--add-batch', metavar='FILE',
+                        help="Add firewall rules listed in FILE ('-' for stdin)")
     parser.add_argument('--analyze', action='store_true', help='Analyze network traffic')
     parser.add_argument('--save', action='store_true', help='Save current firewall configuration')
     parser.add_argument('--restore', action='store_true', help='Restore firewall configuration')
+    parser.add_argument('--verbose', action='store_true', help='Print each rule change')
+    return parser
+
+def main():
+    if sys.platform != 'linux':
+        print("Error: This script is designed for Linux systems with iptables.")
+        sys.exit(1)
+
+    # Skip argparse entirely for well-formed invocations
+    args = parse_args_fast(sys.argv[1:])
+    if args is None:
+        args = build_parser().parse_args()
     
-    args = parser.parse_args()
-    
-    firewall_manager = FirewallRulesManager()
-    
-    if args.list:
-        firewall_manager.list_current_rules()
-    
-    if args.add:
-        firewall_manager.add_rule(args.add[0], args.add[1], int(args.add[2]))
-    
-    if args.delete:
-        firewall_manager.delete_rule(args.delete[0], args.delete[1], int(args.delete[2]))
-    
-    if args.analyze:
-        traffic_analysis = firewall_manager.analyze_traffic()
-        print("Traffic Analysis Results:")
-        print(json.dumps(traffic_analysis, indent=2))
-    
-    if args.save:
-        firewall_manager.save_configuration()
-    
-    if args.restore:
-        firewall_manager.restore_configuration()
+    with FirewallRulesManager(verbose=args.verbose) as firewall_manager:
+        if args.list:
+            firewall_manager.list_current_rules()
+        
+        if args.add:
+            firewall_manager.add_rule(args.add[0], args.add[1], int(args.add[2]))
+        
+        if args.delete:
+            firewall_manager.delete_rule(args.delete[0], args.delete[1], int(args.delete[2]))
+        
+        if args.add_batch:
+            firewall_manager.add_batch(args.add_batch)
+        
+        # Apply all queued rule changes in one transaction
+        firewall_manager.flush()
+        
+        if args.analyze:
+            import json
+            
+            traffic_analysis = firewall_manager.analyze_traffic()
+            print("Traffic Analysis Results:")
+            print(json.dumps(traffic_analysis, indent=2))
+        
+        if args.save:
+            firewall_manager.save_configuration()
+        
+        if args.restore:
+            firewall_manager.restore_configuration()
 
 if __name__ == '__main__':
     main()